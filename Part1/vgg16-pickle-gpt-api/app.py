@@ -1,57 +1,102 @@
 import os
-import numpy as np
-import joblib
+import asyncio
+import tempfile
 
-from flask import Flask, render_template, request
-from werkzeug.utils import secure_filename
+# Quart : même API que Flask, servie en ASGI (hypercorn) avec des handlers non bloquants
+from quart import Quart, render_template, request
 
 # ------------------- VGG16 -------------------
-from keras.preprocessing.image import load_img, img_to_array
-from keras.applications.vgg16 import preprocess_input, decode_predictions, VGG16
+from keras.applications.vgg16 import decode_predictions
 
-# ------------------- GPT-2 -------------------
-from transformers import pipeline
+# ------------------- Inference Backend (framework / onnx) -------------------
+from inference_backend import (
+    INFERENCE_BACKEND,
+    load_vgg16,
+    load_vgg16_embedder,
+    load_pipeline,
+    preprocess_image,
+)
 
-# ------------------- Flask Config -------------------
-app = Flask(__name__)
+# ------------------- Similarity Search -------------------
+from similarity_index import INDEX_DIR, VectorIndex
+
+# ------------------- Régression (rechargement à chaud) -------------------
+from model_registry import HotSwapModel
+
+# ------------------- Executors (un pool borné par modèle) -------------------
+from executors import ExecutorOverloaded, ExecutorTimeout, executor_from_env
+
+# ------------------- App Config -------------------
+app = Quart(__name__)
 
 UPLOAD_FOLDER = "./images/"
 app.config["UPLOAD_FOLDER"] = UPLOAD_FOLDER
 ALLOWED_EXTENSIONS = {"png", "jpg", "jpeg", "gif"}
+# hypercorn importe le module sans passer par __main__
+os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
 # ------------------- Load Models -------------------
 
 # 1️⃣ VGG16
 try:
-    vgg_model = VGG16()
-    print("✅ VGG16 chargé")
+    vgg_model = load_vgg16()
+    print(f"✅ VGG16 chargé (backend: {INFERENCE_BACKEND})")
 except Exception as e:
     print("❌ Erreur VGG16:", e)
     vgg_model = None
 
-# 2️⃣ Régression (joblib)
-regression_model = None
-MODEL_PATH = os.path.join(os.path.dirname(__file__), "models/model.joblib")
+# 1️⃣ bis Embeddings fc2 + index de similarité (rempli par similarity_index.py)
+try:
+    vgg_embedder = load_vgg16_embedder(vgg_model) if vgg_model is not None else None
+except Exception as e:
+    print("❌ Erreur embeddings VGG16:", e)
+    vgg_embedder = None
 
 try:
-    regression_model = joblib.load(MODEL_PATH)
-    print("✅ Modèle de régression chargé")
+    image_index = VectorIndex(INDEX_DIR)
+    print(f"✅ Index de similarité chargé ({len(image_index)} images)")
 except Exception as e:
-    print("❌ Erreur chargement modèle régression:", e)
+    print("❌ Erreur index de similarité:", e)
+    image_index = None
+
+# 2️⃣ Régression (joblib) : l'artefact est surveillé, un nouvel entraînement
+# via train_regression_model.py est pris en compte sans redémarrer l'app
+MODEL_PATH = os.path.join(os.path.dirname(__file__), "models/model.joblib")
+regression_model = HotSwapModel(MODEL_PATH)
 
 # 3️⃣ GPT-2
 try:
-    text_generator = pipeline("text-generation", model="gpt2")
-    print("✅ GPT-2 chargé")
+    text_generator = load_pipeline("text-generation", "gpt2")
+    print(f"✅ GPT-2 chargé (backend: {INFERENCE_BACKEND})")
 except Exception as e:
     print("❌ Erreur GPT-2:", e)
     text_generator = None
 
+# ------------------- Executors -------------------
+# Valeurs par défaut : les modèles coûteux sont plafonnés pour que /regpredict
+# garde une latence basse même quand /textgen est saturé.
+vgg_executor = executor_from_env("vgg", max_workers=2, max_queue=8, timeout=20)
+regression_executor = executor_from_env("regression", max_workers=4, max_queue=64, timeout=2)
+textgen_executor = executor_from_env("textgen", max_workers=1, max_queue=4, timeout=30)
+
 # ------------------- Utils -------------------
 def allowed_file(filename):
     return "." in filename and filename.rsplit(".", 1)[1].lower() in ALLOWED_EXTENSIONS
 
 
+async def save_upload(imagefile):
+    """Enregistre l'upload sous un nom unique : deux clients envoyant `photo.jpg` ne s'écrasent pas."""
+    ext = imagefile.filename.rsplit(".", 1)[1].lower()
+    fd, image_path = tempfile.mkstemp(dir=app.config["UPLOAD_FOLDER"], suffix=f".{ext}")
+    os.close(fd)
+    try:
+        await imagefile.save(image_path)
+    except Exception:
+        os.remove(image_path)
+        raise
+    return image_path
+
+
 def convert_to_int(word):
     mapping = {
         "zero": 0,
@@ -72,84 +117,166 @@ def convert_to_int(word):
     return mapping.get(word.lower(), 0)
 
 
+# ------------------- Inference (exécutée dans les executors) -------------------
+def classify_image(image_path):
+    image = preprocess_image(image_path)
+    image = image.reshape((1, *image.shape))
+
+    preds = vgg_model.predict(image)
+    label = decode_predictions(preds)[0][0]
+    return f"{label[1]} ({label[2]*100:.2f}%)"
+
+
+def find_similar(image_path, k):
+    image = preprocess_image(image_path)
+    embedding = vgg_embedder.predict(image.reshape((1, *image.shape)), verbose=0)
+    return image_index.search(embedding[0], k)
+
+
+def predict_salary(features):
+    return regression_model.predict_one(features)
+
+
+def generate_text(prompt):
+    output = text_generator(prompt, max_length=50, num_return_sequences=1)
+    return output[0]["generated_text"]
+
+
 # ------------------- Routes -------------------
 
 @app.route("/")
-def index():
-    return render_template("index.html")
+async def index():
+    return await render_template("index.html")
 
 
 # ---------- Image Classification ----------
 @app.route("/predict", methods=["POST"])
-def predict():
-    if "imagefile" not in request.files:
-        return render_template("index.html", error="Aucun fichier sélectionné")
+async def predict():
+    if vgg_model is None:
+        return await render_template("index.html", error="VGG16 non chargé"), 503
 
-    imagefile = request.files["imagefile"]
+    files = await request.files
+    if "imagefile" not in files:
+        return await render_template("index.html", error="Aucun fichier sélectionné"), 400
+
+    imagefile = files["imagefile"]
 
     if imagefile.filename == "" or not allowed_file(imagefile.filename):
-        return render_template("index.html", error="Fichier image invalide")
+        return await render_template("index.html", error="Fichier image invalide"), 400
 
-    filename = secure_filename(imagefile.filename)
-    image_path = os.path.join(app.config["UPLOAD_FOLDER"], filename)
-    imagefile.save(image_path)
+    image_path = await save_upload(imagefile)
 
     try:
-        image = load_img(image_path, target_size=(224, 224))
-        image = img_to_array(image)
-        image = image.reshape((1, *image.shape))
-        image = preprocess_input(image)
+        result = await vgg_executor.run(classify_image, image_path)
+        return await render_template("index.html", prediction=result)
 
-        preds = vgg_model.predict(image)
-        label = decode_predictions(preds)[0][0]
-        result = f"{label[1]} ({label[2]*100:.2f}%)"
+    except ExecutorOverloaded as e:
+        return await render_template("index.html", error=str(e)), 503
+    except ExecutorTimeout as e:
+        return await render_template("index.html", error=str(e)), 504
+    except Exception as e:
+        return await render_template("index.html", error=str(e)), 500
+    finally:
+        if os.path.exists(image_path):
+            os.remove(image_path)
+
+
+# ---------- Similar Images ----------
+@app.route("/similar", methods=["POST"])
+async def similar():
+    if vgg_embedder is None or image_index is None:
+        return await render_template("index.html", error="Index de similarité non chargé"), 503
+
+    # Prend en compte une ingestion faite depuis le démarrage de l'app
+    # (relit paths.txt : fait hors de la boucle d'événements)
+    await asyncio.to_thread(image_index.refresh)
+    if len(image_index) == 0:
+        return await render_template("index.html", error="Index de similarité vide"), 503
+
+    files = await request.files
+    form = await request.form
+    imagefile = files.get("imagefile")
+    if imagefile is None or imagefile.filename == "" or not allowed_file(imagefile.filename):
+        return await render_template("index.html", error="Fichier image invalide"), 400
 
-        os.remove(image_path)
-        return render_template("index.html", prediction=result)
+    try:
+        k = max(1, min(int(form.get("k", 10)), 100))
+    except ValueError:
+        return await render_template("index.html", error="k doit être un entier"), 400
 
+    image_path = await save_upload(imagefile)
+
+    try:
+        # Même executor que /predict : les deux saturent le même modèle VGG16
+        results = await vgg_executor.run(find_similar, image_path, k)
+        return await render_template("index.html", similar_images=results)
+
+    except ExecutorOverloaded as e:
+        return await render_template("index.html", error=str(e)), 503
+    except ExecutorTimeout as e:
+        return await render_template("index.html", error=str(e)), 504
     except Exception as e:
-        return render_template("index.html", error=str(e))
+        return await render_template("index.html", error=str(e)), 500
+    finally:
+        if os.path.exists(image_path):
+            os.remove(image_path)
 
 
 # ---------- Regression ----------
 @app.route("/regpredict", methods=["POST"])
-def regpredict():
-    if regression_model is None:
-        return render_template("index.html", error="Modèle de régression non chargé")
+async def regpredict():
+    if regression_model.predictor is None:
+        return await render_template("index.html", error="Modèle de régression non chargé"), 503
 
+    form = await request.form
     try:
-        experience = convert_to_int(request.form.get("experience"))
-        test_score = float(request.form.get("test_score"))
-        interview_score = float(request.form.get("interview_score"))
+        experience = convert_to_int(form.get("experience"))
+        test_score = float(form.get("test_score"))
+        interview_score = float(form.get("interview_score"))
+    except (AttributeError, TypeError, ValueError) as e:
+        return await render_template("index.html", error=f"Entrée invalide: {e}"), 400
 
-        X = np.array([[experience, test_score, interview_score]])
-        prediction = regression_model.predict(X)
+    try:
+        prediction = await regression_executor.run(
+            predict_salary, [experience, test_score, interview_score]
+        )
+
+        result = f"Salaire prédit : {prediction:.2f}"
+        return await render_template("index.html", regression_prediction=result)
 
-        result = f"Salaire prédit : {prediction[0]:.2f}"
-        return render_template("index.html", regression_prediction=result)
+    except ExecutorOverloaded as e:
+        return await render_template("index.html", error=str(e)), 503
+    except ExecutorTimeout as e:
+        return await render_template("index.html", error=str(e)), 504
 
     except Exception as e:
-        return render_template("index.html", error=f"Erreur régression: {e}")
+        return await render_template("index.html", error=f"Erreur régression: {e}"), 500
 
 
 # ---------- Text Generation ----------
 @app.route("/textgen", methods=["POST"])
-def textgen():
+async def textgen():
     if text_generator is None:
-        return render_template("index.html", error="GPT-2 non chargé")
+        return await render_template("index.html", error="GPT-2 non chargé"), 503
 
-    prompt = request.form.get("prompt_text")
+    prompt = (await request.form).get("prompt_text")
+    if not prompt:
+        return await render_template("index.html", error="Prompt vide"), 400
 
     try:
-        output = text_generator(prompt, max_length=50, num_return_sequences=1)
-        generated = output[0]["generated_text"]
-        return render_template("index.html", textgen_result=generated)
+        generated = await textgen_executor.run(generate_text, prompt)
+        return await render_template("index.html", textgen_result=generated)
+
+    except ExecutorOverloaded as e:
+        return await render_template("index.html", error=str(e)), 503
+    except ExecutorTimeout as e:
+        return await render_template("index.html", error=str(e)), 504
 
     except Exception as e:
-        return render_template("index.html", error=str(e))
+        return await render_template("index.html", error=str(e)), 500
 
 
 # ------------------- Main -------------------
 if __name__ == "__main__":
-    os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+    # Serveur de dev ; en production : hypercorn app:app --bind 0.0.0.0:3000 (voir Dockerfile)
     app.run(debug=True, port=3000)
@@ -0,0 +1,126 @@
+import os
+import time
+import importlib.util
+import numpy as np
+
+from keras.preprocessing.image import load_img, img_to_array
+from keras.applications.vgg16 import preprocess_input, decode_predictions, VGG16
+from transformers import pipeline
+
+from inference_backend import load_onnx_vgg16, load_onnx_pipeline
+
+# Rapport de parité (sorties framework vs ONNX) et de latence par modèle.
+# Usage : python benchmark_onnx.py   (variables ORT_INTRA_OP_THREADS / ORT_INTER_OP_THREADS respectées)
+
+N_RUNS = int(os.environ.get("BENCH_RUNS", "20"))
+IMAGE_PATH = os.path.join(os.path.dirname(__file__), "images/cat2.jpg")
+GPT2_PROMPT = "Machine learning deployment is"
+SENTIMENT_MODEL = "distilbert-base-uncased-finetuned-sst-2-english"
+# Backend ONNX du DAG Airflow (Part2), chargé par chemin : ajouter Dags/ au sys.path
+# masquerait le vrai paquet `torch` par Dags/torch.py
+DAG_ONNX_BACKEND_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "../../Part2/AirFlow/Dags/onnx_backend.py"
+)
+SENTIMENT_TEXTS = [
+    "This video was amazing, thanks for sharing!",
+    "Worst tutorial I have ever watched.",
+    "Not bad, but the audio could be better.",
+]
+
+
+def time_call(fn, n_runs=N_RUNS):
+    fn()  # échauffement
+    timings = []
+    for _ in range(n_runs):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return np.percentile(timings, 50), np.percentile(timings, 99)
+
+
+def print_report(name, parity, framework_times, onnx_times):
+    print("-" * 60)
+    print(f"{name}")
+    for key, value in parity.items():
+        print(f"  {key}: {value}")
+    print(f"  framework p50/p99 : {framework_times[0]:.2f} / {framework_times[1]:.2f} ms")
+    print(f"  onnx      p50/p99 : {onnx_times[0]:.2f} / {onnx_times[1]:.2f} ms")
+    print(f"  speedup (p50)     : {framework_times[0] / onnx_times[0]:.2f}x")
+
+
+def bench_vgg16():
+    keras_model = VGG16()
+    onnx_model = load_onnx_vgg16(keras_model)
+
+    image = img_to_array(load_img(IMAGE_PATH, target_size=(224, 224)))
+    image = preprocess_input(image.reshape((1, *image.shape)))
+
+    keras_preds = keras_model.predict(image, verbose=0)
+    onnx_preds = onnx_model.predict(image)
+    parity = {
+        "max abs diff": f"{np.abs(keras_preds - onnx_preds).max():.2e}",
+        "top-1 framework": decode_predictions(keras_preds)[0][0][1],
+        "top-1 onnx": decode_predictions(onnx_preds)[0][0][1],
+    }
+    print_report(
+        "VGG16",
+        parity,
+        time_call(lambda: keras_model.predict(image, verbose=0)),
+        time_call(lambda: onnx_model.predict(image)),
+    )
+
+
+def bench_gpt2():
+    framework_gen = pipeline("text-generation", model="gpt2")
+    onnx_gen = load_onnx_pipeline("text-generation", "gpt2")
+    # Décodage glouton pour que les deux sorties soient comparables
+    kwargs = {"max_length": 50, "do_sample": False, "num_return_sequences": 1}
+
+    framework_text = framework_gen(GPT2_PROMPT, **kwargs)[0]["generated_text"]
+    onnx_text = onnx_gen(GPT2_PROMPT, **kwargs)[0]["generated_text"]
+    parity = {"greedy output identical": framework_text == onnx_text}
+    print_report(
+        "GPT-2",
+        parity,
+        time_call(lambda: framework_gen(GPT2_PROMPT, **kwargs), n_runs=max(N_RUNS // 4, 1)),
+        time_call(lambda: onnx_gen(GPT2_PROMPT, **kwargs), n_runs=max(N_RUNS // 4, 1)),
+    )
+
+
+def load_dag_onnx_backend():
+    spec = importlib.util.spec_from_file_location("dag_onnx_backend", DAG_ONNX_BACKEND_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def bench_distilbert():
+    # Même chemin que l'ANALYZER de modeling.py, backend ONNX forcé
+    dag_backend = load_dag_onnx_backend()
+    dag_backend.INFERENCE_BACKEND = "onnx"
+
+    framework_clf = pipeline("sentiment-analysis", model=SENTIMENT_MODEL)
+    onnx_clf = dag_backend.load_sentiment_pipeline(SENTIMENT_MODEL)
+    if not type(onnx_clf.model).__name__.startswith("ORTModel"):
+        raise RuntimeError("load_sentiment_pipeline est retombé sur transformers, rien à comparer")
+
+    framework_res = framework_clf(SENTIMENT_TEXTS)
+    onnx_res = onnx_clf(SENTIMENT_TEXTS)
+    parity = {
+        "labels identical": [r["label"] for r in framework_res]
+        == [r["label"] for r in onnx_res],
+        "max score diff": f"{max(abs(a['score'] - b['score']) for a, b in zip(framework_res, onnx_res)):.2e}",
+    }
+    print_report(
+        "DistilBERT (sentiment)",
+        parity,
+        time_call(lambda: framework_clf(SENTIMENT_TEXTS)),
+        time_call(lambda: onnx_clf(SENTIMENT_TEXTS)),
+    )
+
+
+if __name__ == "__main__":
+    bench_vgg16()
+    bench_gpt2()
+    bench_distilbert()
+    print("-" * 60)
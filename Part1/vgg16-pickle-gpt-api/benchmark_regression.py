@@ -0,0 +1,40 @@
+import os
+import time
+import joblib
+import numpy as np
+
+from model_registry import compile_predictor
+
+# Latence par requête de /regpredict : estimator sklearn vs chemin rapide précompilé.
+# Usage : python benchmark_regression.py
+
+N_RUNS = int(os.environ.get("BENCH_RUNS", "10000"))
+MODEL_PATH = os.path.join(os.path.dirname(__file__), "models/model.joblib")
+FEATURES = [5, 8.0, 9.0]
+
+
+def time_call(fn, n_runs=N_RUNS):
+    fn()  # échauffement
+    timings = []
+    for _ in range(n_runs):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1e6)
+    return np.percentile(timings, 50), np.percentile(timings, 99)
+
+
+if __name__ == "__main__":
+    model = joblib.load(MODEL_PATH)
+    predictor = compile_predictor(model, n_features=len(FEATURES))
+
+    before = time_call(lambda: model.predict(np.array([FEATURES]))[0])
+    after = time_call(lambda: predictor.predict_one(FEATURES))
+    diff = abs(model.predict(np.array([FEATURES]))[0] - predictor.predict_one(FEATURES))
+
+    print("-" * 60)
+    print(f"Prédicteur       : {type(predictor).__name__}")
+    print(f"Écart absolu     : {diff:.2e}")
+    print(f"sklearn p50/p99  : {before[0]:.1f} / {before[1]:.1f} µs")
+    print(f"fast path p50/p99: {after[0]:.1f} / {after[1]:.1f} µs")
+    print(f"speedup (p50)    : {before[0] / after[0]:.1f}x")
+    print("-" * 60)
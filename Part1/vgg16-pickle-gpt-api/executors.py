@@ -0,0 +1,58 @@
+import os
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class ExecutorOverloaded(Exception):
+    """File d'attente du modèle pleine : la requête est rejetée (backpressure)."""
+
+
+class ExecutorTimeout(Exception):
+    """Le modèle n'a pas répondu dans le délai imparti."""
+
+
+class ModelExecutor:
+    """Pool de threads borné dédié à un modèle.
+
+    `max_workers` inférences tournent en parallèle, au plus `max_queue` attendent ;
+    au-delà la requête est rejetée immédiatement au lieu de bloquer les autres endpoints.
+    `run` est une coroutine : la boucle ASGI reste libre pendant l'inférence, une requête
+    lente n'occupe qu'un thread du pool de son modèle.
+    """
+
+    def __init__(self, name, max_workers, max_queue, timeout):
+        self.name = name
+        self.timeout = timeout
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        # Libéré quand le calcul se termine réellement (pas au timeout côté client)
+        self.slots = threading.BoundedSemaphore(max_workers + max_queue)
+
+    async def run(self, fn, *args, **kwargs):
+        if not self.slots.acquire(blocking=False):
+            raise ExecutorOverloaded(f"{self.name} saturé, réessayez plus tard")
+
+        try:
+            future = self.pool.submit(fn, *args, **kwargs)
+        except Exception:
+            self.slots.release()
+            raise
+        future.add_done_callback(lambda _: self.slots.release())
+
+        try:
+            # wait_for annule le future s'il attend encore dans la file ; sinon il se termine
+            # en arrière-plan et libère son slot à la fin
+            return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+        except asyncio.TimeoutError:
+            raise ExecutorTimeout(f"{self.name} : délai de {self.timeout}s dépassé")
+
+
+def executor_from_env(name, max_workers, max_queue, timeout):
+    # ex. TEXTGEN_MAX_WORKERS=2 TEXTGEN_MAX_QUEUE=4 TEXTGEN_TIMEOUT=30
+    prefix = name.upper()
+    return ModelExecutor(
+        name,
+        max_workers=int(os.environ.get(f"{prefix}_MAX_WORKERS", max_workers)),
+        max_queue=int(os.environ.get(f"{prefix}_MAX_QUEUE", max_queue)),
+        timeout=float(os.environ.get(f"{prefix}_TIMEOUT", timeout)),
+    )
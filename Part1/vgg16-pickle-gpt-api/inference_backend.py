@@ -0,0 +1,188 @@
+import os
+import shutil
+import numpy as np
+
+# ------------------- Backend Config -------------------
+# "framework" : chemin par défaut (Keras / transformers en mode eager)
+# "onnx"      : export ONNX mis en cache + ONNX Runtime, repli sur "framework" si échec
+INFERENCE_BACKEND = os.environ.get("INFERENCE_BACKEND", "framework").lower()
+
+ONNX_CACHE_DIR = os.environ.get(
+    "ONNX_CACHE_DIR", os.path.join(os.path.dirname(__file__), "models/onnx")
+)
+ORT_INTRA_OP_THREADS = int(os.environ.get("ORT_INTRA_OP_THREADS", "0"))
+ORT_INTER_OP_THREADS = int(os.environ.get("ORT_INTER_OP_THREADS", "0"))
+
+
+# ------------------- ONNX Runtime -------------------
+def make_session_options():
+    import onnxruntime as ort
+
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    # 0 = laisser ONNX Runtime choisir le nombre de threads
+    options.intra_op_num_threads = ORT_INTRA_OP_THREADS
+    options.inter_op_num_threads = ORT_INTER_OP_THREADS
+    if ORT_INTER_OP_THREADS > 1:
+        options.execution_mode = ort.ExecutionMode.ORT_PARALLEL
+    return options
+
+
+class OnnxImageModel:
+    """Enveloppe une session ONNX Runtime avec la même interface que `model.predict`."""
+
+    def __init__(self, onnx_path):
+        import onnxruntime as ort
+
+        self.session = ort.InferenceSession(
+            onnx_path,
+            sess_options=make_session_options(),
+            providers=["CPUExecutionProvider"],
+        )
+        self.input_name = self.session.get_inputs()[0].name
+        # Session fc2 (embeddings), renseignée par load_onnx_vgg16
+        self.embedder = None
+
+    def predict(self, x, verbose=0):
+        x = np.asarray(x, dtype=np.float32)
+        return self.session.run(None, {self.input_name: x})[0]
+
+
+# ------------------- Export (une seule fois, puis cache) -------------------
+def export_keras_model(keras_model, name, force=False):
+    onnx_path = os.path.join(ONNX_CACHE_DIR, f"{name}.onnx")
+    if os.path.exists(onnx_path):
+        if not force:
+            return onnx_path
+        # Cache illisible : on le supprime pour réexporter
+        os.remove(onnx_path)
+
+    import tensorflow as tf
+    import tf2onnx
+
+    os.makedirs(ONNX_CACHE_DIR, exist_ok=True)
+    input_shape = keras_model.inputs[0].shape
+    spec = (tf.TensorSpec((None, *input_shape[1:]), tf.float32, name="input"),)
+    tmp_path = onnx_path + ".tmp"
+    tf2onnx.convert.from_keras(keras_model, input_signature=spec, output_path=tmp_path)
+    os.replace(tmp_path, onnx_path)
+    return onnx_path
+
+
+def export_hf_model(ort_model_class, model_name):
+    export_dir = os.path.join(ONNX_CACHE_DIR, model_name.replace("/", "__"))
+    if os.path.exists(os.path.join(export_dir, "model.onnx")):
+        return ort_model_class.from_pretrained(
+            export_dir, session_options=make_session_options()
+        )
+
+    model = ort_model_class.from_pretrained(
+        model_name, export=True, session_options=make_session_options()
+    )
+    # Sauvegarde dans un dossier temporaire puis renommage : un export interrompu
+    # ne laisse jamais un `model.onnx` sans sa config dans le cache
+    tmp_dir = export_dir + ".tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    model.save_pretrained(tmp_dir)
+    shutil.rmtree(export_dir, ignore_errors=True)
+    os.replace(tmp_dir, export_dir)
+    return model
+
+
+# ------------------- Loaders -------------------
+def load_onnx_vgg16(keras_model=None, force_export=False):
+    """Sessions VGG16 + fc2 ; `keras_model` n'est requis que si les exports ne sont pas en cache."""
+    if keras_model is None:
+        onnx_path = os.path.join(ONNX_CACHE_DIR, "vgg16.onnx")
+        fc2_path = os.path.join(ONNX_CACHE_DIR, "vgg16_fc2.onnx")
+    else:
+        onnx_path = export_keras_model(keras_model, "vgg16", force=force_export)
+        fc2_path = export_keras_model(
+            keras_fc2_model(keras_model), "vgg16_fc2", force=force_export
+        )
+
+    onnx_model = OnnxImageModel(onnx_path)
+    onnx_model.embedder = OnnxImageModel(fc2_path)
+    return onnx_model
+
+
+def onnx_vgg16_cached():
+    return all(
+        os.path.exists(os.path.join(ONNX_CACHE_DIR, f"{name}.onnx"))
+        for name in ("vgg16", "vgg16_fc2")
+    )
+
+
+def load_onnx_pipeline(task, model_name):
+    from transformers import AutoTokenizer, pipeline
+    from optimum.onnxruntime import (
+        ORTModelForCausalLM,
+        ORTModelForSequenceClassification,
+    )
+
+    ort_model_classes = {
+        "text-generation": ORTModelForCausalLM,
+        "sentiment-analysis": ORTModelForSequenceClassification,
+    }
+    model = export_hf_model(ort_model_classes[task], model_name)
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    return pipeline(task, model=model, tokenizer=tokenizer)
+
+
+def load_vgg16():
+    from keras.applications.vgg16 import VGG16
+
+    force_export = False
+    if INFERENCE_BACKEND == "onnx" and onnx_vgg16_cached():
+        # Exports déjà en cache : inutile de charger les poids Keras (~500 Mo)
+        try:
+            return load_onnx_vgg16()
+        except Exception as e:
+            print("⚠️ Cache ONNX VGG16 illisible, nouvel export:", e)
+            force_export = True
+
+    keras_model = VGG16()
+    if INFERENCE_BACKEND != "onnx":
+        return keras_model
+
+    try:
+        return load_onnx_vgg16(keras_model, force_export=force_export)
+    except Exception as e:
+        print("⚠️ ONNX VGG16 indisponible, repli sur Keras:", e)
+        return keras_model
+
+
+def load_pipeline(task, model_name):
+    if INFERENCE_BACKEND == "onnx":
+        try:
+            return load_onnx_pipeline(task, model_name)
+        except Exception as e:
+            print(f"⚠️ ONNX {model_name} indisponible, repli sur transformers:", e)
+
+    from transformers import pipeline
+
+    return pipeline(task, model=model_name)
+
+
+# ------------------- Embeddings (couche fc2) -------------------
+def keras_fc2_model(keras_model):
+    from keras.models import Model
+
+    # Partage les poids du modèle déjà chargé, aucune copie
+    return Model(inputs=keras_model.input, outputs=keras_model.get_layer("fc2").output)
+
+
+def load_vgg16_embedder(vgg_model):
+    """Modèle qui renvoie l'avant-dernière couche (fc2, 4096 dims) du VGG16 chargé."""
+    if isinstance(vgg_model, OnnxImageModel):
+        return vgg_model.embedder
+    return keras_fc2_model(vgg_model)
+
+
+def preprocess_image(image_path):
+    from keras.preprocessing.image import load_img, img_to_array
+    from keras.applications.vgg16 import preprocess_input
+
+    image = load_img(image_path, target_size=(224, 224))
+    image = img_to_array(image)
+    return preprocess_input(image)
@@ -0,0 +1,116 @@
+import os
+import sys
+import time
+import random
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+import uuid
+from collections import defaultdict
+import numpy as np
+
+# Test de charge mixte : beaucoup de /regpredict (rapide) mêlés à des /textgen et /predict (lents).
+# Usage : python app.py &  puis  python loadtest.py [http://localhost:3000]
+
+BASE_URL = sys.argv[1] if len(sys.argv) > 1 else "http://localhost:3000"
+DURATION = float(os.environ.get("LOADTEST_DURATION", "30"))
+CONCURRENCY = int(os.environ.get("LOADTEST_CONCURRENCY", "16"))
+TEXTGEN_RATIO = float(os.environ.get("LOADTEST_TEXTGEN_RATIO", "0.1"))
+PREDICT_RATIO = float(os.environ.get("LOADTEST_PREDICT_RATIO", "0.1"))
+IMAGE_PATH = os.path.join(os.path.dirname(__file__), "images/cat2.jpg")
+
+ENDPOINTS = {
+    "/regpredict": {"experience": "five", "test_score": "8", "interview_score": "9"},
+    "/textgen": {"prompt_text": "Machine learning deployment is"},
+    "/predict": None,  # multipart, voir encode_image
+}
+# Bloc affiché par index.html quand le handler a échoué
+ERROR_MARKER = b"alert-danger"
+
+latencies = defaultdict(list)
+statuses = defaultdict(lambda: defaultdict(int))
+lock = threading.Lock()
+
+
+def encode_image():
+    boundary = uuid.uuid4().hex
+    with open(IMAGE_PATH, "rb") as f:
+        image = f.read()
+    body = (
+        f"--{boundary}\r\n"
+        'Content-Disposition: form-data; name="imagefile"; filename="loadtest.jpg"\r\n'
+        "Content-Type: image/jpeg\r\n\r\n"
+    ).encode() + image + f"\r\n--{boundary}--\r\n".encode()
+    return body, f"multipart/form-data; boundary={boundary}"
+
+
+def build_request(path):
+    if path == "/predict":
+        data, content_type = encode_image()
+    else:
+        data = urllib.parse.urlencode(ENDPOINTS[path]).encode()
+        content_type = "application/x-www-form-urlencoded"
+    return urllib.request.Request(
+        BASE_URL + path, data=data, headers={"Content-Type": content_type}
+    )
+
+
+def send(path):
+    req = build_request(path)
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=60) as resp:
+            body = resp.read()
+            # Un 200 avec une page d'erreur ne compte pas comme une réponse valide
+            status = resp.status if ERROR_MARKER not in body else "200-error"
+    except urllib.error.HTTPError as e:
+        status = e.code
+    except Exception:
+        status = "error"
+    elapsed = (time.perf_counter() - start) * 1000
+
+    with lock:
+        statuses[path][status] += 1
+        if status == 200:
+            latencies[path].append(elapsed)
+
+
+def worker(deadline):
+    while time.time() < deadline:
+        draw = random.random()
+        if draw < TEXTGEN_RATIO:
+            path = "/textgen"
+        elif draw < TEXTGEN_RATIO + PREDICT_RATIO:
+            path = "/predict"
+        else:
+            path = "/regpredict"
+        send(path)
+
+
+def main():
+    deadline = time.time() + DURATION
+    threads = [threading.Thread(target=worker, args=(deadline,)) for _ in range(CONCURRENCY)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    print("-" * 60)
+    print(
+        f"{BASE_URL} | {CONCURRENCY} clients | {DURATION:.0f}s | "
+        f"textgen {TEXTGEN_RATIO:.0%} | predict {PREDICT_RATIO:.0%}"
+    )
+    for path in ENDPOINTS:
+        timings = latencies[path]
+        codes = dict(statuses[path])
+        if timings:
+            p50, p99 = np.percentile(timings, 50), np.percentile(timings, 99)
+            print(f"{path:12} ok={len(timings):5d}  p50={p50:8.1f} ms  p99={p99:8.1f} ms  {codes}")
+        else:
+            print(f"{path:12} aucune réponse 200  {codes}")
+    print("-" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+import os
+import time
+import threading
+import joblib
+import numpy as np
+
+# Intervalle de surveillance de l'artefact (secondes)
+MODEL_POLL_INTERVAL = float(os.environ.get("MODEL_POLL_INTERVAL", "2"))
+# experience, test_score, interview_score
+N_FEATURES = 3
+
+
+class LinearFastPath:
+    """Prédicteur précompilé pour un modèle linéaire : coefficients figés, sans validation sklearn."""
+
+    def __init__(self, coef, intercept):
+        self.coef = np.asarray(coef, dtype=np.float64).ravel()
+        self.intercept = float(intercept)
+        # Pour une seule ligne, une somme en Python pur bat l'appel numpy
+        self.coef_list = self.coef.tolist()
+
+    def predict_one(self, features):
+        return self.intercept + sum(c * x for c, x in zip(self.coef_list, features))
+
+    def predict(self, X):
+        return np.asarray(X, dtype=np.float64) @ self.coef + self.intercept
+
+
+class EstimatorPredictor:
+    """Repli générique pour les modèles non linéaires : passe par `model.predict`."""
+
+    def __init__(self, model):
+        self.model = model
+
+    def predict_one(self, features):
+        return float(self.model.predict(np.array([features]))[0])
+
+    def predict(self, X):
+        return self.model.predict(X)
+
+
+def fast_path_matches(model, fast_path, n_features):
+    # Les GLM (Poisson, Gamma, Tweedie...) ont aussi coef_/intercept_ mais appliquent
+    # une fonction de lien : on vérifie sur des lignes sondes que X@coef+b == predict(X)
+    probe = np.random.default_rng(42).uniform(-10, 10, size=(8, n_features))
+    return np.allclose(fast_path.predict(probe), model.predict(probe), rtol=1e-6, atol=1e-6)
+
+
+def compile_predictor(model, n_features=N_FEATURES):
+    n_features_in = getattr(model, "n_features_in_", None)
+    if n_features_in != n_features:
+        # Levé pendant reload() : la version précédente reste en service
+        raise ValueError(f"le modèle attend {n_features_in} features, l'app en fournit {n_features}")
+
+    coef = getattr(model, "coef_", None)
+    intercept = getattr(model, "intercept_", None)
+    if coef is not None and intercept is not None and np.ndim(coef) == 1 and len(coef) == n_features:
+        fast_path = LinearFastPath(coef, intercept)
+        if fast_path_matches(model, fast_path, n_features):
+            return fast_path
+    return EstimatorPredictor(model)
+
+
+class HotSwapModel:
+    """Surveille un artefact joblib et remplace le modèle à chaud quand il change.
+
+    Le nouveau modèle est chargé et compilé à côté de l'ancien, puis publié par une seule
+    affectation : une requête en cours garde la version qu'elle a lue, aucune n'est perdue.
+    """
+
+    def __init__(self, path, poll_interval=MODEL_POLL_INTERVAL):
+        self.path = path
+        self.poll_interval = poll_interval
+        self.version = 0
+        self.predictor = None
+        self.signature = None
+        try:
+            self.reload()
+        except Exception as e:
+            print("❌ Erreur chargement modèle régression:", e)
+
+        self.watcher = threading.Thread(target=self.watch, daemon=True, name="model-watcher")
+        self.watcher.start()
+
+    def artifact_signature(self):
+        stat = os.stat(self.path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def reload(self):
+        if not os.path.exists(self.path):
+            return False
+        signature = self.artifact_signature()
+        if signature == self.signature:
+            return False
+
+        # Signature notée avant le chargement : un artefact invalide n'est retenté qu'une fois modifié
+        self.signature = signature
+        predictor = compile_predictor(joblib.load(self.path))
+        self.predictor = predictor
+        self.version += 1
+        print(f"✅ Modèle de régression chargé (version {self.version}, {type(predictor).__name__})")
+        return True
+
+    def watch(self):
+        while True:
+            time.sleep(self.poll_interval)
+            try:
+                self.reload()
+            except Exception as e:
+                # On garde la version précédente si le nouvel artefact est illisible
+                print("❌ Erreur rechargement modèle régression:", e)
+
+    def predict_one(self, features):
+        return self.predictor.predict_one(features)
@@ -0,0 +1,220 @@
+import os
+import sys
+import json
+import numpy as np
+
+# ------------------- Index Config -------------------
+INDEX_DIR = os.environ.get(
+    "SIMILARITY_INDEX_DIR", os.path.join(os.path.dirname(__file__), "models/image_index")
+)
+# Les embeddings fc2 (4096 dims) sont projetés par PCA avant stockage :
+# 256 dims en float32 = 1 Ko par image, une requête sur 400k images prend ~40 ms sur CPU.
+# 0 = stocker les embeddings bruts.
+INDEX_DIM = int(os.environ.get("SIMILARITY_INDEX_DIM", "256"))
+PROJECTION_FIT_SIZE = int(os.environ.get("SIMILARITY_PROJECTION_FIT_SIZE", "2048"))
+IMAGE_EXTENSIONS = {"png", "jpg", "jpeg", "gif"}
+
+
+class VectorIndex:
+    """Index de vecteurs normalisés (L2) stocké dans un fichier memory-mapped.
+
+    Fichiers du dossier : `vectors.f32` (matrice n x dim), `paths.txt` (une image par
+    ligne), `projection.npz` (PCA optionnelle) et `meta.json`, écrit en dernier : seules
+    les `count` premières lignes sont visibles. Chaque ajout repart de la ligne `count`,
+    les restes d'un ajout interrompu sont donc écrasés au lieu de décaler l'index.
+    """
+
+    def __init__(self, index_dir=INDEX_DIR):
+        self.index_dir = index_dir
+        self.vectors_path = os.path.join(index_dir, "vectors.f32")
+        self.paths_path = os.path.join(index_dir, "paths.txt")
+        self.projection_path = os.path.join(index_dir, "projection.npz")
+        self.meta_path = os.path.join(index_dir, "meta.json")
+
+        self.mean = None
+        self.components = None
+        self.meta_mtime = None
+        # (vecteurs memmap, chemins) remplacés ensemble pour rester cohérents entre threads
+        self.state = (np.zeros((0, 0), dtype=np.float32), [])
+        # Fichiers ramenés à `count` lignes depuis le dernier chargement (voir repair)
+        self.repaired = False
+        self.refresh()
+
+    def __len__(self):
+        return len(self.state[1])
+
+    # ---------- Chargement ----------
+    def refresh(self):
+        """Recharge l'index si `meta.json` a changé (ingestion faite par un autre process)."""
+        if not os.path.exists(self.meta_path):
+            return
+        mtime = os.path.getmtime(self.meta_path)
+        if mtime == self.meta_mtime:
+            return
+
+        with open(self.meta_path) as f:
+            meta = json.load(f)
+        count, dim = meta["count"], meta["dim"]
+
+        if os.path.exists(self.projection_path):
+            projection = np.load(self.projection_path)
+            self.mean, self.components = projection["mean"], projection["components"]
+
+        with open(self.paths_path, encoding="utf-8") as f:
+            paths = f.read().splitlines()[:count]
+        if count:
+            vectors = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(count, dim))
+        else:
+            vectors = np.zeros((0, dim), dtype=np.float32)
+
+        self.state = (vectors, paths)
+        self.meta_mtime = mtime
+        self.repaired = False
+
+    # ---------- Projection ----------
+    def fit_projection(self, embeddings, dim):
+        from sklearn.decomposition import PCA
+
+        if embeddings.shape[0] < dim:
+            # Une PCA sur N < dim images figerait tout le catalogue à N dimensions
+            raise ValueError(
+                f"{embeddings.shape[0]} images pour ajuster une projection à {dim} dimensions : "
+                f"indexer au moins {dim} images au premier passage, ou SIMILARITY_INDEX_DIM=0"
+            )
+        pca = PCA(n_components=dim, random_state=42).fit(embeddings)
+        self.mean = pca.mean_.astype(np.float32)
+        self.components = pca.components_.astype(np.float32)
+
+        os.makedirs(self.index_dir, exist_ok=True)
+        np.savez(self.projection_path, mean=self.mean, components=self.components)
+
+    def project(self, embeddings):
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        if self.components is not None:
+            embeddings = (embeddings - self.mean) @ self.components.T
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        return embeddings / np.maximum(norms, 1e-12)
+
+    # ---------- Écriture ----------
+    def repair(self):
+        """Supprime les lignes au-delà de `count` (ajout précédent interrompu avant meta.json).
+
+        Appelé une fois avant une ingestion ; les `add()` suivants ne relisent plus les fichiers.
+        """
+        vectors, paths = self.state
+        if os.path.exists(self.vectors_path):
+            with open(self.vectors_path, "r+b") as f:
+                f.truncate(vectors.nbytes)
+        if os.path.exists(self.paths_path):
+            with open(self.paths_path, "r+b") as f:
+                f.truncate(sum(len(path.encode("utf-8")) + 1 for path in paths))
+        self.repaired = True
+
+    def add(self, embeddings, paths):
+        if not self.repaired:
+            self.repair()
+        vectors = self.project(embeddings)
+        known_paths = self.state[1]
+        count, dim = len(known_paths) + len(paths), vectors.shape[1]
+        os.makedirs(self.index_dir, exist_ok=True)
+
+        with open(self.vectors_path, "ab") as f:
+            vectors.tofile(f)
+        with open(self.paths_path, "a", encoding="utf-8") as f:
+            f.writelines(f"{path}\n" for path in paths)
+
+        tmp_path = self.meta_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"count": count, "dim": dim}, f)
+        os.replace(tmp_path, self.meta_path)
+
+        # Mise à jour en mémoire, sans relire paths.txt : l'ajout en place reste sûr pour
+        # les lecteurs, qui n'indexent les chemins que jusqu'à len(vecteurs)
+        known_paths.extend(paths)
+        vectors = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(count, dim))
+        self.state = (vectors, known_paths)
+        self.meta_mtime = os.path.getmtime(self.meta_path)
+
+    # ---------- Recherche ----------
+    def search(self, embedding, k=10):
+        """Top-k par similarité cosinus : `[(chemin, score), ...]` du plus proche au moins proche."""
+        self.refresh()
+        vectors, paths = self.state
+        if not paths:
+            return []
+
+        if k < 1:
+            raise ValueError(f"k doit être >= 1 (reçu {k})")
+
+        query = self.project(np.reshape(embedding, (1, -1)))[0]
+        scores = vectors @ query
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(paths[i], float(scores[i])) for i in top]
+
+
+# ------------------- Ingestion -------------------
+def list_images(image_dir):
+    for root, _, files in os.walk(image_dir):
+        for name in sorted(files):
+            if name.rsplit(".", 1)[-1].lower() in IMAGE_EXTENSIONS:
+                yield os.path.join(root, name)
+
+
+def embed_batches(embedder, image_paths, batch_size):
+    from inference_backend import preprocess_image
+
+    for start in range(0, len(image_paths), batch_size):
+        images, paths = [], []
+        for path in image_paths[start:start + batch_size]:
+            try:
+                images.append(preprocess_image(path))
+                paths.append(path)
+            except Exception as e:
+                print(f"❌ Image ignorée {path}: {e}")
+        if images:
+            yield embedder.predict(np.stack(images), verbose=0), paths
+
+
+def ingest_directory(index, embedder, image_dir, batch_size=64, dim=INDEX_DIM):
+    index.repair()
+    known = set(index.state[1])
+    image_paths = [p for p in list_images(image_dir) if p not in known]
+    print(f"{len(image_paths)} nouvelles images à indexer")
+
+    # Index vide : on accumule un échantillon pour ajuster la PCA avant le premier ajout
+    needs_projection = dim > 0 and len(index) == 0 and index.components is None
+    fit_size = max(PROJECTION_FIT_SIZE, dim)
+    pending, pending_paths = [], []
+
+    for embeddings, paths in embed_batches(embedder, image_paths, batch_size):
+        if needs_projection:
+            pending.append(embeddings)
+            pending_paths.extend(paths)
+            if len(pending_paths) < fit_size:
+                continue
+            embeddings, paths = np.concatenate(pending), pending_paths
+            index.fit_projection(embeddings, dim)
+            needs_projection, pending, pending_paths = False, [], []
+
+        index.add(embeddings, paths)
+        print(f"✅ {len(index)} images indexées")
+
+    if pending:
+        # Moins de `fit_size` images au total : la PCA exige tout de même `dim` images
+        embeddings = np.concatenate(pending)
+        index.fit_projection(embeddings, dim)
+        index.add(embeddings, pending_paths)
+        print(f"✅ {len(index)} images indexées")
+
+
+if __name__ == "__main__":
+    # Usage : python similarity_index.py <dossier_images> [batch_size]
+    from inference_backend import load_vgg16, load_vgg16_embedder
+
+    image_dir = sys.argv[1]
+    batch_size = int(sys.argv[2]) if len(sys.argv) > 2 else 64
+
+    embedder = load_vgg16_embedder(load_vgg16())
+    ingest_directory(VectorIndex(INDEX_DIR), embedder, image_dir, batch_size)
@@ -1,3 +1,4 @@
+import os
 import pandas as pd
 import joblib
 from sklearn.linear_model import LinearRegression
@@ -24,5 +25,7 @@ y = dataset.iloc[:, -1]
 model = LinearRegression()
 model.fit(X, y)
 
-joblib.dump(model, "./models/model.joblib")
+# Écriture atomique : l'app (HotSwapModel) ne lit jamais un fichier à moitié écrit
+joblib.dump(model, "./models/model.joblib.tmp")
+os.replace("./models/model.joblib.tmp", "./models/model.joblib")
 print("✅ Modèle sauvegardé")
@@ -1,6 +1,5 @@
 from airflow import Dataset
 import os
-from transformers import pipeline
 import pandas as pd
 import ast
 from sklearn.model_selection import train_test_split
@@ -8,6 +7,8 @@ from sklearn.ensemble import RandomForestRegressor
 from sklearn.metrics import mean_squared_error, r2_score
 from sklearn.preprocessing import OneHotEncoder
 
+from onnx_backend import load_sentiment_pipeline
+
 
 VIDEO_DATASET_PATH = Dataset(
     f"{os.path.dirname(os.path.abspath(__file__))}/data/video_data.csv"
@@ -23,9 +24,8 @@ PP_COMMENTS_DATASET_PATH = Dataset(
 )
 
 
-ANALYZER = pipeline(
-    "sentiment-analysis", model="distilbert-base-uncased-finetuned-sst-2-english"
-)
+SENTIMENT_MODEL = "distilbert-base-uncased-finetuned-sst-2-english"
+ANALYZER = load_sentiment_pipeline(SENTIMENT_MODEL)
 
 
 def calculate_video_sentiment(comments_list):
@@ -0,0 +1,61 @@
+import os
+import shutil
+from transformers import pipeline
+
+# "framework" : pipeline transformers par défaut (PyTorch eager)
+# "onnx"      : export ONNX mis en cache + ONNX Runtime, repli sur "framework" si échec
+INFERENCE_BACKEND = os.environ.get("INFERENCE_BACKEND", "framework").lower()
+
+ONNX_CACHE_DIR = os.environ.get(
+    "ONNX_CACHE_DIR", f"{os.path.dirname(os.path.abspath(__file__))}/models/onnx"
+)
+ORT_INTRA_OP_THREADS = int(os.environ.get("ORT_INTRA_OP_THREADS", "0"))
+ORT_INTER_OP_THREADS = int(os.environ.get("ORT_INTER_OP_THREADS", "0"))
+
+
+def make_session_options():
+    import onnxruntime as ort
+
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    options.intra_op_num_threads = ORT_INTRA_OP_THREADS
+    options.inter_op_num_threads = ORT_INTER_OP_THREADS
+    # ONNX Runtime ignore inter_op_num_threads en mode séquentiel
+    if ORT_INTER_OP_THREADS > 1:
+        options.execution_mode = ort.ExecutionMode.ORT_PARALLEL
+    return options
+
+
+def load_onnx_sentiment_pipeline(model_name):
+    from transformers import AutoTokenizer
+    from optimum.onnxruntime import ORTModelForSequenceClassification
+
+    export_dir = f"{ONNX_CACHE_DIR}/{model_name.replace('/', '__')}"
+    if os.path.exists(f"{export_dir}/model.onnx"):
+        model = ORTModelForSequenceClassification.from_pretrained(
+            export_dir, session_options=make_session_options()
+        )
+    else:
+        model = ORTModelForSequenceClassification.from_pretrained(
+            model_name, export=True, session_options=make_session_options()
+        )
+        # Dossier temporaire puis renommage : un export tué (timeout Airflow)
+        # ne laisse pas un cache incomplet qui passerait le test `model.onnx`
+        tmp_dir = f"{export_dir}.tmp"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        model.save_pretrained(tmp_dir)
+        shutil.rmtree(export_dir, ignore_errors=True)
+        os.replace(tmp_dir, export_dir)
+
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    return pipeline("sentiment-analysis", model=model, tokenizer=tokenizer)
+
+
+def load_sentiment_pipeline(model_name):
+    if INFERENCE_BACKEND == "onnx":
+        try:
+            return load_onnx_sentiment_pipeline(model_name)
+        except Exception as e:
+            print(f"ONNX backend unavailable for {model_name}, falling back: {e}")
+
+    return pipeline("sentiment-analysis", model=model_name)